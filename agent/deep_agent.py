@@ -11,9 +11,14 @@ Deep Agent includes by default:
 Plus custom tools: MCP integration & Opportunities management
 """
 
+import logging
 import os
+from typing import Optional
+
+import httpx
 from dotenv import load_dotenv
 from deepagents import create_deep_agent, FilesystemMiddleware, SubAgentMiddleware
+from langchain_core.caches import BaseCache, InMemoryCache
 from langchain_openai import ChatOpenAI
 
 from agent.mcp_tools import get_mcp_tools
@@ -22,44 +27,81 @@ from agent.opportunities_manager import get_opportunities_tools
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-async def create_crypto_deep_agent():
-    """
-    Create a Deep Agent using LangChain 1.0 create_agent with middleware
-    
-    Per Docs by LangChain, this provides:
-    - FilesystemMiddleware: 6 tools (ls, read_file, write_file, edit_file, glob, grep)
-    - TodoListMiddleware: 1 tool (write_todos)
-    - SubAgentMiddleware: 1 tool (task)
-    - Custom tools: MCP integration & Opportunities management
-    
-    Total: 8 built-in + 7 custom = 15 tools
+# Connection pool shared by every model client. Agent runs reuse warm
+# keep-alive TLS connections to OpenRouter instead of paying connection
+# setup each time a new ChatOpenAI client is built. Idle connections are
+# dropped before the upstream's own idle timeout closes them under us.
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=30,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+_http_async_client = None
+
+
+def _get_http_async_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client for model calls"""
+    global _http_async_client
+    if _http_async_client is None:
+        _http_async_client = httpx.AsyncClient(
+            limits=_HTTP_LIMITS,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+    return _http_async_client
+
+
+_model = None
+
+
+def _get_llm_cache() -> Optional[BaseCache]:
+    """Exact-match response cache keyed on (prompt messages, model params)
+
+    Off by default: a cache hit returns the whole response at once and emits
+    no on_chat_model_stream events. Set LLM_CACHE=1 for a bounded in-process
+    cache, or LLM_CACHE_PATH to persist it in SQLite (needs
+    langchain-community).
     """
-    print("🚀 Initializing Crypto Analyst Deep Agent...")
-    
-    # Configure model
-    openrouter_key = os.getenv("OPENROUTER_API_KEY")
-    if not openrouter_key:
-        raise ValueError("OPENROUTER_API_KEY not found in environment variables")
-    
-    model = ChatOpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=openrouter_key,
-        model="anthropic/claude-3.5-sonnet",
-        temperature=0.7,
-        default_headers={
-            "HTTP-Referer": "http://localhost:8000",
-            "X-Title": "Crypto Analyst Deep Agent"
-        }
-    )
-    
-    # Get custom tools
-    mcp_tools = get_mcp_tools()
-    opportunities_tools = get_opportunities_tools()
-    custom_tools = mcp_tools + opportunities_tools
-    
-    # System prompt
-    system_prompt = """You are an expert cryptocurrency analyst with access to multiple data sources and tools.
+    cache_path = os.getenv("LLM_CACHE_PATH")
+    if cache_path:
+        from langchain_community.cache import SQLiteCache
+        
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        return SQLiteCache(database_path=cache_path)
+    if os.getenv("LLM_CACHE") == "1":
+        return InMemoryCache(maxsize=1000)
+    return None
+
+
+def _get_model() -> ChatOpenAI:
+    """Return the process-wide OpenRouter chat model, creating it on first use"""
+    global _model
+    if _model is None:
+        openrouter_key = os.getenv("OPENROUTER_API_KEY")
+        if not openrouter_key:
+            raise ValueError("OPENROUTER_API_KEY not found in environment variables")
+        
+        _model = ChatOpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=openrouter_key,
+            model="anthropic/claude-3.5-sonnet",
+            temperature=0.7,
+            streaming=True,
+            cache=_get_llm_cache(),
+            max_retries=2,
+            timeout=30.0,
+            http_async_client=_get_http_async_client(),
+            default_headers={
+                "HTTP-Referer": "http://localhost:8000",
+                "X-Title": "Crypto Analyst Deep Agent"
+            }
+        )
+    return _model
+
+
+# System prompt (built once at import, shared by every agent instance)
+SYSTEM_PROMPT = """You are an expert cryptocurrency analyst with access to multiple data sources and tools.
 
 Your capabilities:
 1. **Market Data Analysis** (via CoinGecko MCP)
@@ -102,6 +144,7 @@ When you identify a potential opportunity:
 
 **Guidelines:**
 - Be data-driven: Always cite your sources
+- When you need several independent MCP lookups (e.g. price, sentiment and news for a coin), make a single `batch_query` call with all of them instead of calling the MCP tools one at a time
 - Be honest about confidence levels
 - Update opportunities when new data emerges
 - Use clear, actionable language
@@ -113,6 +156,28 @@ When you identify a potential opportunity:
 - Provide clear recommendations
 - Include relevant metrics
 """
+
+
+async def create_crypto_deep_agent():
+    """
+    Create a Deep Agent using LangChain 1.0 create_agent with middleware
+    
+    Per Docs by LangChain, this provides:
+    - FilesystemMiddleware: 6 tools (ls, read_file, write_file, edit_file, glob, grep)
+    - TodoListMiddleware: 1 tool (write_todos)
+    - SubAgentMiddleware: 1 tool (task)
+    - Custom tools: MCP integration & Opportunities management
+    
+    Total: 8 built-in + 8 custom = 16 tools
+    """
+    logger.info("Initializing Crypto Analyst Deep Agent")
+    
+    model = _get_model()
+    
+    # Get custom tools
+    mcp_tools = get_mcp_tools()
+    opportunities_tools = get_opportunities_tools()
+    custom_tools = mcp_tools + opportunities_tools
     
     # Create Deep Agent using official create_deep_agent
     # Per Docs by LangChain, this automatically includes:
@@ -122,19 +187,17 @@ When you identify a potential opportunity:
     agent = create_deep_agent(
         model=model,
         tools=custom_tools,
-        system_prompt=system_prompt,
+        system_prompt=SYSTEM_PROMPT,
         name="crypto_analyst_agent"
     )
     
-    print("✅ Deep Agent initialized successfully!")
-    print(f"📊 Custom tools: {len(custom_tools)}")
-    print(f"   - MCP Tools: {len(mcp_tools)}")
-    print(f"   - Opportunities Tools: {len(opportunities_tools)}")
-    print(f"📁 Built-in Deep Agent tools: ~8")
-    print(f"   - Filesystem: 6 (ls, read_file, write_file, edit_file, glob, grep)")
-    print(f"   - Todos: 1 (write_todos)")
-    print(f"   - Subagents: 1 (task)")
-    print(f"🎯 Total tools: {len(custom_tools)} + 8 built-in")
+    logger.info(
+        "Deep Agent initialized: %d custom tools (mcp=%d, opportunities=%d) "
+        "+ 8 built-in (filesystem=6, todos=1, subagents=1)",
+        len(custom_tools),
+        len(mcp_tools),
+        len(opportunities_tools),
+    )
     
     return agent
 
@@ -143,6 +206,8 @@ When you identify a potential opportunity:
 if __name__ == "__main__":
     import asyncio
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     async def main():
         agent = await create_crypto_deep_agent()
         
@@ -151,17 +216,28 @@ if __name__ == "__main__":
         print("Testing agent with a query...")
         print("="*60 + "\n")
         
-        result = await agent.ainvoke({
+        print("Agent Response:")
+        print("="*60)
+        # Stream tokens as they are generated instead of waiting for the full run
+        streamed = set()
+        async for event in agent.astream_events({
             "messages": [{
                 "role": "user",
                 "content": "Hello! Can you introduce yourself?"
             }]
-        })
-        
-        print("\n" + "="*60)
-        print("Agent Response:")
-        print("="*60)
-        print(result)
+        }, version="v2"):
+            if event["event"] == "on_chat_model_stream":
+                streamed.add(event["run_id"])
+                print(event["data"]["chunk"].content, end="", flush=True)
+            elif event["event"] == "on_chat_model_end" and event["run_id"] not in streamed:
+                # Cached responses arrive whole, without stream events
+                print(event["data"]["output"].content, end="", flush=True)
+        print()
     
-    asyncio.run(main())
-
+    try:
+        # uvloop is a faster drop-in event loop (not available on Windows)
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
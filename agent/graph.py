@@ -1,21 +1,34 @@
 """
 Graph entry point para LangSmith Deployment
-Este arquivo exporta o agent compilado para deploy no LangSmith
+Este arquivo exporta a factory do agent para deploy no LangSmith
 """
 
 import asyncio
+
 from agent.deep_agent import create_crypto_deep_agent
 
-# Criar o agent de forma síncrona para LangSmith
+# A configuração de logging fica com o processo host (servidor LangGraph);
+# os loggers agent.* apenas propagam para os handlers dele
+
+# O agent é criado sob demanda, dentro do event loop de quem o usa
 _agent = None
+_agent_lock = asyncio.Lock()
+
 
-def get_agent():
-    """Lazy loading do agent"""
+async def get_agent(config=None):
+    """Lazy loading do agent (graph factory usada pelo langgraph.json)"""
     global _agent
     if _agent is None:
-        _agent = asyncio.run(create_crypto_deep_agent())
+        async with _agent_lock:
+            if _agent is None:
+                _agent = await create_crypto_deep_agent()
     return _agent
 
-# Exportar agent para LangSmith
-agent = get_agent()
 
+def __getattr__(name):
+    if name == "agent":
+        raise AttributeError(
+            "agent.graph.agent is no longer built at import time; "
+            "use `await get_agent()` instead"
+        )
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
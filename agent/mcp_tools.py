@@ -4,47 +4,272 @@ Connects to CoinGecko, Firecrawl, and Santiment MCP servers
 """
 
 import asyncio
+import functools
+import hashlib
+import itertools
 import json
-import subprocess
-from typing import Any, Dict, List, Optional
+import logging
+import os
+import threading
+import time
+from abc import abstractmethod
+from pathlib import Path
+from typing import Any, ClassVar, Coroutine, Dict, List, Optional, Set, Tuple
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 
 class MCPToolInput(BaseModel):
     """Input schema for MCP tools"""
     params: Dict[str, Any] = Field(description="Parameters for the MCP tool")
 
 
+class MCPServerConfig(BaseModel):
+    """Launch settings for one MCP server in mcp_config.json"""
+    command: str
+    args: List[str] = Field(default_factory=list)
+    env: Dict[str, str] = Field(default_factory=dict)
+
+
+class MCPConfig(BaseModel):
+    """Shape of mcp_config.json"""
+    mcpServers: Dict[str, MCPServerConfig] = Field(default_factory=dict)
+
+
+@functools.lru_cache(maxsize=None)
+def load_mcp_config(config_path: str) -> MCPConfig:
+    """Parse and validate an MCP config file once per path"""
+    return MCPConfig.model_validate_json(Path(config_path).read_bytes())
+
+
+class MCPServerError(RuntimeError):
+    """Raised when an MCP server answers a request with a JSON-RPC error or has exited"""
+
+
 class MCPServerManager:
-    """Manages connections to multiple MCP servers"""
+    """Manages connections to multiple MCP servers
     
-    def __init__(self, config_path: str = "mcp_config.json"):
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        self.servers = config.get("mcpServers", {})
-        self.processes = {}
+    Each server is launched once and kept running. Requests are multiplexed
+    over its stdio as newline-delimited JSON-RPC messages; a reader task per
+    server resolves the pending futures by request id.
+    """
+    
+    # Scraped pages can be large; asyncio's default line limit is 64 KiB
+    STREAM_LIMIT = 16 * 1024 * 1024
+    PROTOCOL_VERSION = "2024-11-05"
+    
+    def __init__(self, config_path: Optional[str] = None):
+        config = load_mcp_config(config_path or os.getenv("MCP_CONFIG", "mcp_config.json"))
+        self.servers = config.mcpServers
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
+        self._readers: Dict[str, asyncio.Task] = {}
+        self._pending: Dict[str, Dict[int, asyncio.Future]] = {}
+        # Servers whose stdout closed; requests to them fail fast
+        self._exited: Set[str] = set()
+        self._request_ids = itertools.count(1)
     
     async def start_servers(self):
-        """Start all MCP servers"""
+        """Start all MCP servers and run the initialize handshake"""
         for name, config in self.servers.items():
             try:
-                print(f"Starting MCP server: {name}")
-                # In production, you'd start these as background processes
-                # For now, we'll just validate the configuration
-                print(f"✓ {name} configured: {config['command']} {' '.join(config['args'])}")
+                logger.info("Starting MCP server: %s", name)
+                process = await asyncio.create_subprocess_exec(
+                    config.command,
+                    *config.args,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    env={**os.environ, **config.env},
+                    limit=self.STREAM_LIMIT,
+                )
+                self.processes[name] = process
+                self._pending[name] = {}
+                self._exited.discard(name)
+                self._readers[name] = asyncio.create_task(self._pump(name, process))
+                await self.request(name, "initialize", {
+                    "protocolVersion": self.PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "crypto-analyst-agent", "version": "1.0.0"},
+                })
+                await self._send(name, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+                logger.info("MCP server %s started: %s %s", name, config.command, " ".join(config.args))
             except Exception as e:
-                print(f"✗ Failed to start {name}: {e}")
+                logger.warning("Failed to start MCP server %s: %s", name, e)
+                await self._stop_server(name)
+    
+    async def request(
+        self,
+        name: str,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0,
+    ) -> Any:
+        """Send a JSON-RPC request to a running server and await its result"""
+        if name not in self.processes:
+            raise KeyError(f"MCP server not running: {name}")
+        if name in self._exited:
+            raise MCPServerError(f"{name}: server exited")
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending[name]
+        pending[request_id] = future
+        try:
+            await self._send(name, {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params or {},
+            })
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            pending.pop(request_id, None)
+    
+    async def _send(self, name: str, message: Dict[str, Any]) -> None:
+        stdin = self.processes[name].stdin
+        stdin.write(json.dumps(message).encode() + b"\n")
+        await stdin.drain()
+    
+    async def _pump(self, name: str, process: asyncio.subprocess.Process) -> None:
+        """Read responses from a server and resolve the matching futures"""
+        pending = self._pending[name]
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                # Notifications and server-initiated requests have no pending future
+                future = pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(MCPServerError(f"{name}: {message['error']}"))
+                else:
+                    future.set_result(message.get("result"))
+        finally:
+            self._exited.add(name)
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(MCPServerError(f"{name}: server exited"))
+    
+    async def _stop_server(self, name: str, timeout: float = 5.0) -> None:
+        process = self.processes.pop(name, None)
+        if process is not None:
+            # Closing stdin is the MCP stdio shutdown signal; kill only if ignored
+            if process.stdin and not process.stdin.is_closing():
+                process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+            logger.info("Stopped MCP server: %s", name)
+        reader = self._readers.pop(name, None)
+        if reader is not None:
+            reader.cancel()
+        self._pending.pop(name, None)
     
     async def stop_servers(self):
         """Stop all MCP servers"""
-        for name, process in self.processes.items():
-            if process:
-                process.terminate()
-                print(f"Stopped MCP server: {name}")
+        for name in list(self.processes):
+            await self._stop_server(name)
+
+
+class ToolResultCache:
+    """In-process cache of tool results with a per-entry time-to-live"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: Dict[str, Tuple[float, str]] = {}
+        # Sync callers run tools on a background loop thread (see _run_sync)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                now = time.monotonic()
+                for stale in [k for k, (exp, _) in self._entries.items() if exp < now]:
+                    del self._entries[stale]
+                if len(self._entries) >= self.maxsize:
+                    # Dicts keep insertion order, so this drops the oldest entry
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_tool_cache = ToolResultCache()
+
+# Sync callers share one background event loop. asyncio.run() per call would
+# raise inside a running loop and pay loop setup on every call.
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _run_sync(coro: Coroutine[Any, Any, str]) -> str:
+    """Run a tool coroutine from synchronous code and wait for its result"""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_sync_loop.run_forever, name="mcp-tools-sync", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
+
+class CachedMCPTool(BaseTool):
+    """Base class for MCP tools whose results are cached by normalized params
+
+    Subclasses implement `_query`. The TTL comes from `cache_ttls` keyed on
+    the "action" param, falling back to `default_cache_ttl` (seconds).
+    """
 
+    cache_ttls: ClassVar[Dict[str, float]] = {}
+    default_cache_ttl: ClassVar[float] = 60
 
-class CoinGeckoMCPTool(BaseTool):
+    @abstractmethod
+    async def _query(self, params: Dict[str, Any]) -> str:
+        """Run the uncached query against the MCP server"""
+
+    async def _arun(self, params: Dict[str, Any]) -> str:
+        """Execute the query, serving repeated calls from the cache"""
+        normalized = json.dumps(params, sort_keys=True, default=str)
+        key = hashlib.sha256(f"{self.name}:{normalized}".encode()).hexdigest()
+        cached = _tool_cache.get(key)
+        if cached is not None:
+            return f"{cached}\n[X-Cache: HIT]"
+
+        result = await self._query(params)
+        # Tools report failures as "Error..." strings; never cache those
+        if not result.startswith("Error"):
+            ttl = self.cache_ttls.get(params.get("action"), self.default_cache_ttl)
+            _tool_cache.set(key, result, ttl)
+        return f"{result}\n[X-Cache: MISS]"
+    
+    def _run(self, params: Dict[str, Any]) -> str:
+        """Synchronous version for callers outside the agent's event loop"""
+        return _run_sync(self._arun(params))
+
+
+class CoinGeckoMCPTool(CachedMCPTool):
     """Tool to query CoinGecko data via MCP"""
     
     name: str = "coingecko_query"
@@ -62,8 +287,13 @@ class CoinGeckoMCPTool(BaseTool):
     - {"action": "get_trending"}
     - {"action": "get_market_data", "coin_id": "ethereum"}
     """
+    cache_ttls: ClassVar[Dict[str, float]] = {
+        "get_price": 15,
+        "get_market_data": 15,
+        "get_trending": 60,
+    }
     
-    async def _arun(self, params: Dict[str, Any]) -> str:
+    async def _query(self, params: Dict[str, Any]) -> str:
         """Execute CoinGecko query asynchronously"""
         try:
             # In production, this would call the actual MCP server
@@ -81,13 +311,9 @@ class CoinGeckoMCPTool(BaseTool):
         
         except Exception as e:
             return f"Error querying CoinGecko: {str(e)}"
-    
-    def _run(self, params: Dict[str, Any]) -> str:
-        """Synchronous version"""
-        return asyncio.run(self._arun(params))
 
 
-class FirecrawlMCPTool(BaseTool):
+class FirecrawlMCPTool(CachedMCPTool):
     """Tool to scrape web content via Firecrawl MCP"""
     
     name: str = "firecrawl_scrape"
@@ -103,8 +329,9 @@ class FirecrawlMCPTool(BaseTool):
     - {"url": "https://example.com", "format": "markdown"}
     - {"url": "https://cryptonews.com/article", "extract": ["title", "content"]}
     """
+    default_cache_ttl: ClassVar[float] = 300
     
-    async def _arun(self, params: Dict[str, Any]) -> str:
+    async def _query(self, params: Dict[str, Any]) -> str:
         """Execute Firecrawl scraping asynchronously"""
         try:
             url = params.get("url")
@@ -115,13 +342,9 @@ class FirecrawlMCPTool(BaseTool):
         
         except Exception as e:
             return f"Error scraping with Firecrawl: {str(e)}"
-    
-    def _run(self, params: Dict[str, Any]) -> str:
-        """Synchronous version"""
-        return asyncio.run(self._arun(params))
 
 
-class SantimentMCPTool(BaseTool):
+class SantimentMCPTool(CachedMCPTool):
     """Tool to query Santiment data via custom MCP"""
     
     name: str = "santiment_query"
@@ -139,8 +362,13 @@ class SantimentMCPTool(BaseTool):
     - {"action": "get_onchain_metrics", "coin": "ethereum", "metric": "active_addresses"}
     - {"action": "get_dev_activity", "project": "polkadot"}
     """
+    cache_ttls: ClassVar[Dict[str, float]] = {
+        "get_sentiment": 300,
+        "get_onchain_metrics": 300,
+        "get_dev_activity": 86400,
+    }
     
-    async def _arun(self, params: Dict[str, Any]) -> str:
+    async def _query(self, params: Dict[str, Any]) -> str:
         """Execute Santiment query asynchronously"""
         try:
             action = params.get("action", "get_sentiment")
@@ -150,17 +378,67 @@ class SantimentMCPTool(BaseTool):
         
         except Exception as e:
             return f"Error querying Santiment: {str(e)}"
+
+
+class MCPSubQuery(BaseModel):
+    """A single query inside a batch_query call"""
+    tool: str = Field(description="MCP tool name: coingecko_query, firecrawl_scrape or santiment_query")
+    params: Dict[str, Any] = Field(description="Parameters for that MCP tool")
+
+
+class BatchQueryInput(BaseModel):
+    """Input schema for the batch MCP tool"""
+    queries: List[MCPSubQuery] = Field(description="Independent MCP queries to run concurrently")
+
+
+class BatchMCPTool(BaseTool):
+    """Tool to run several independent MCP queries concurrently"""
     
-    def _run(self, params: Dict[str, Any]) -> str:
-        """Synchronous version"""
-        return asyncio.run(self._arun(params))
+    name: str = "batch_query"
+    description: str = """
+    Run several independent MCP queries in one call. The queries run
+    concurrently, so this is much faster than calling the tools one by one.
+    Use it whenever the queries do not depend on each other's results.
+    
+    Example queries:
+    - [{"tool": "coingecko_query", "params": {"action": "get_price", "coin_id": "bitcoin"}},
+       {"tool": "santiment_query", "params": {"action": "get_sentiment", "coin": "bitcoin"}},
+       {"tool": "firecrawl_scrape", "params": {"url": "https://cryptonews.com"}}]
+    """
+    args_schema: type[BaseModel] = BatchQueryInput
+    
+    async def _arun(self, queries: List[MCPSubQuery]) -> str:
+        """Dispatch all queries with asyncio.gather and aggregate the results"""
+        tools = {tool.name: tool for tool in _get_query_tools()}
+        
+        async def dispatch(query: MCPSubQuery) -> str:
+            tool = tools.get(query.tool)
+            if tool is None:
+                return f"Error: unknown tool '{query.tool}' (expected one of: {', '.join(tools)})"
+            return await tool._arun(query.params)
+        
+        results = await asyncio.gather(*(dispatch(q) for q in queries), return_exceptions=True)
+        sections = []
+        for index, (query, result) in enumerate(zip(queries, results), 1):
+            if isinstance(result, BaseException):
+                result = f"Error running {query.tool}: {result}"
+            sections.append(f"### {index}. {query.tool}\n{result}")
+        return "\n\n".join(sections)
+    
+    def _run(self, queries: List[MCPSubQuery]) -> str:
+        """Synchronous version for callers outside the agent's event loop"""
+        return _run_sync(self._arun(queries))
 
 
-def get_mcp_tools() -> List[BaseTool]:
-    """Get all MCP tools for the agent"""
+def _get_query_tools() -> List[CachedMCPTool]:
     return [
         CoinGeckoMCPTool(),
         FirecrawlMCPTool(),
         SantimentMCPTool(),
     ]
 
+
+def get_mcp_tools() -> List[BaseTool]:
+    """Get all MCP tools for the agent"""
+    return [*_get_query_tools(), BatchMCPTool()]
+
@@ -0,0 +1,70 @@
+"""
+Metrics Math - Numeric helpers for opportunity metric series
+
+numpy and numba are not in any requirements file, so deployments always
+use the pure-Python path; the JIT path only runs in local installs that
+add them (pip install numpy numba).
+"""
+
+import math
+from numbers import Real
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+
+# Below this many points the JIT dispatch costs more than the loop it replaces
+NUMBA_MIN_POINTS = 100
+
+# Compiled reducer, loaded on the first long series (False: numba unavailable)
+_summarize_jit: Any = None
+
+
+def _load_jit() -> Optional[Callable]:
+    """Import numpy + numba (both optional) and compile the reducer once."""
+
+    global _summarize_jit
+    if _summarize_jit is None:
+        try:
+            import numpy as np
+            from numba import njit
+        except ImportError:
+            _summarize_jit = False
+        else:
+
+            @njit(cache=True, fastmath=True)
+            def summarize_array(values):
+                return values.mean(), values.std(), values.max()
+
+            def summarize_values(values):
+                return summarize_array(np.asarray(values, dtype=np.float64))
+
+            _summarize_jit = summarize_values
+    return _summarize_jit or None
+
+
+def is_numeric_series(value: Any) -> bool:
+    """True for a non-empty list/tuple made only of real numbers."""
+
+    return (
+        isinstance(value, (list, tuple))
+        and bool(value)
+        and all(isinstance(v, Real) and not isinstance(v, bool) for v in value)
+    )
+
+
+def summarize(values: Sequence[float]) -> Tuple[float, float, float]:
+    """Return (mean, population std, max) of a non-empty numeric series.
+
+    Raises OverflowError/ValueError when the values are too large to reduce
+    as floats.
+    """
+
+    if len(values) >= NUMBA_MIN_POINTS:
+        summarize_jit = _load_jit()
+        if summarize_jit is not None:
+            mean, std, peak = summarize_jit(values)
+            return float(mean), float(std), float(peak)
+
+    count = len(values)
+    mean = math.fsum(values) / count
+    variance = math.fsum((v - mean) ** 2 for v in values) / count
+    return mean, math.sqrt(variance), float(max(values))
@@ -2,19 +2,49 @@
 Opportunities Manager - Tools for managing investment opportunities
 """
 
-import json
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+import itertools
+import os
+import secrets
+import time
+import weakref
+from bisect import insort
+from operator import attrgetter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from langchain.tools import ToolRuntime, tool
-from langgraph.store.base import BaseStore
-from pydantic import BaseModel, Field
+from langgraph.store.base import BaseStore, GetOp, PutOp
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter
+
+from agent.metrics_math import is_numeric_series, summarize
+
+
+_last_ts_ms = 0
+_last_iso = ""
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO-8601 string with millisecond precision.
+
+    The formatted string is reused for calls within the same millisecond,
+    which is common when seeding or updating opportunities in bulk.
+    """
+
+    global _last_ts_ms, _last_iso
+    ts_ms = time.time_ns() // 1_000_000
+    if ts_ms != _last_ts_ms:
+        _last_iso = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).isoformat(
+            timespec="milliseconds"
+        )
+        _last_ts_ms = ts_ms
+    return _last_iso
 
 
 class Opportunity(BaseModel):
     """Schema for an investment opportunity"""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     id: str = Field(description="Unique identifier for the opportunity")
     title: str = Field(description="Title/name of the opportunity")
     asset: str = Field(description="Asset or cryptocurrency")
@@ -23,12 +53,58 @@ class Opportunity(BaseModel):
     rationale: str = Field(description="Why this is an opportunity")
     sources: List[str] = Field(default_factory=list, description="Data sources used")
     metrics: Dict[str, Any] = Field(default_factory=dict, description="Relevant metrics")
-    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = Field(default_factory=utc_now_iso)
     expires_at: Optional[str] = Field(default=None, description="When this opportunity expires")
     status: str = Field(default="active", description="active, expired, executed, dismissed")
     tags: List[str] = Field(default_factory=list, description="Tags for categorization")
     updated_at: Optional[str] = Field(default=None, description="Last update timestamp")
 
+    _dump_cache: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """model_dump() memoized per instance (safe because the model is frozen).
+
+        The returned dict is shared between callers: treat it as read-only and
+        use model_dump() when a mutable copy is needed.
+        """
+        if self._dump_cache is None:
+            self._dump_cache = self.model_dump()
+        return self._dump_cache
+
+    def model_copy(
+        self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "Opportunity":
+        copied = super().model_copy(update=update, deep=deep)
+        # Private attributes are copied too; the memoized dump may be stale
+        copied._dump_cache = None
+        return copied
+
+
+class OpportunityPatch(BaseModel):
+    """Partial update for an opportunity: only the fields that are set change.
+
+    Validating the patch checks just the changed fields, so updates can be
+    applied with model_copy() instead of re-validating the whole opportunity.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    title: Optional[str] = None
+    asset: Optional[str] = None
+    type: Optional[str] = None
+    confidence: Optional[float] = Field(default=None, ge=0, le=100)
+    rationale: Optional[str] = None
+    sources: Optional[List[str]] = None
+    metrics: Optional[Dict[str, Any]] = None
+    created_at: Optional[str] = None
+    expires_at: Optional[str] = None
+    status: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+    def changes(self) -> Dict[str, Any]:
+        """Return the fields that were set to a value"""
+        return self.model_dump(exclude_unset=True, exclude_none=True)
+
 
 DEFAULT_OPPORTUNITIES: List[Opportunity] = [
     Opportunity(
@@ -57,99 +133,350 @@ DEFAULT_OPPORTUNITIES: List[Opportunity] = [
 
 STORE_NAMESPACE = ("opportunities",)
 
+_OPPORTUNITIES_ADAPTER = TypeAdapter(List[Opportunity])
+
+# Values written by this module are complete, validated dumps, so reads
+# rebuild them with model_construct() and skip validation. Other writers
+# share the namespace (the frontend PUT route merges raw updates into it),
+# so any value that doesn't look like such a dump is validated instead.
+# Set to False to validate every value read back.
+TRUST_STORE_DATA = True
+
+_FIELD_NAMES = frozenset(Opportunity.model_fields)
+_STR_FIELDS = ("id", "title", "asset", "type", "rationale", "created_at", "status")
+_STR_LIST_FIELDS = ("sources", "tags")
+
 
 class InMemoryOpportunities:
-    """Fallback in-memory store used when LangGraph Store is unavailable."""
+    """Fallback in-memory store used when LangGraph Store is unavailable.
+
+    Rows are kept as parallel columns (struct-of-arrays) in insertion order:
+    status filters scan the flat `_statuses` list instead of walking every
+    model, and deleted rows are tombstoned with None until compaction.
+    """
 
     def __init__(self):
-        self._items: Dict[str, Opportunity] = {opp.id: opp for opp in DEFAULT_OPPORTUNITIES}
+        self._row_by_id: Dict[str, int] = {}
+        self._statuses: List[Optional[str]] = []
+        self._opportunities: List[Optional[Opportunity]] = []
+        self._deleted = 0
+        # Inverted index tag -> ids, so tag filters only touch matching rows
+        self._ids_by_tag: Dict[str, Set[str]] = {}
+        # Listing results per (status, tags) filter, cleared on every write
+        self._list_cache: Dict[Tuple[Optional[str], Tuple[str, ...]], List[Opportunity]] = {}
+        for opp in DEFAULT_OPPORTUNITIES:
+            self.add(opp)
+
+    def _index(self, opportunity: Opportunity) -> None:
+        for tag in opportunity.tags:
+            self._ids_by_tag.setdefault(tag, set()).add(opportunity.id)
+
+    def _unindex(self, opportunity: Opportunity) -> None:
+        for tag in opportunity.tags:
+            ids = self._ids_by_tag.get(tag)
+            if ids is not None:
+                ids.discard(opportunity.id)
+                if not ids:
+                    del self._ids_by_tag[tag]
+
+    def _compact(self) -> None:
+        live = [i for i, opp in enumerate(self._opportunities) if opp is not None]
+        self._statuses = [self._statuses[i] for i in live]
+        self._opportunities = [self._opportunities[i] for i in live]
+        self._row_by_id = {opp.id: row for row, opp in enumerate(self._opportunities)}
+        self._deleted = 0
 
     def add(self, opportunity: Opportunity) -> None:
-        self._items[opportunity.id] = opportunity
-
-    def list_all(self) -> List[Opportunity]:
-        return list(self._items.values())
+        row = self._row_by_id.get(opportunity.id)
+        if row is None:
+            self._row_by_id[opportunity.id] = len(self._opportunities)
+            self._statuses.append(opportunity.status)
+            self._opportunities.append(opportunity)
+        else:
+            self._unindex(self._opportunities[row])
+            self._statuses[row] = opportunity.status
+            self._opportunities[row] = opportunity
+        self._index(opportunity)
+        self._list_cache.clear()
+
+    def list_all(
+        self, status: Optional[str] = None, tags: Optional[List[str]] = None
+    ) -> List[Opportunity]:
+        key = (status, tuple(sorted(tags or ())))
+        cached = self._list_cache.get(key)
+        if cached is None:
+            if len(self._list_cache) >= 128:
+                self._list_cache.clear()
+            cached = self._list_cache[key] = self._query(status, tags)
+        return list(cached)
+
+    def _query(
+        self, status: Optional[str], tags: Optional[List[str]]
+    ) -> List[Opportunity]:
+        opportunities, statuses = self._opportunities, self._statuses
+        if tags:
+            ids = set().union(*(self._ids_by_tag.get(tag, ()) for tag in tags))
+            rows = sorted(self._row_by_id[i] for i in ids)
+        elif status:
+            return [opportunities[row] for row, s in enumerate(statuses) if s == status]
+        else:
+            return [opp for opp in opportunities if opp is not None]
+        if status:
+            rows = [row for row in rows if statuses[row] == status]
+        return [opportunities[row] for row in rows]
 
     def get(self, opportunity_id: str) -> Optional[Opportunity]:
-        return self._items.get(opportunity_id)
+        row = self._row_by_id.get(opportunity_id)
+        return None if row is None else self._opportunities[row]
+
+    def update(
+        self, opportunity_id: str, updates: Dict[str, Any]
+    ) -> Optional[Opportunity]:
+        """Apply `updates` and return the new opportunity (None if not found)."""
+        current = self.get(opportunity_id)
+        if current is None:
+            return None
+        # Callers pass validated fields (see OpportunityPatch), so copy the
+        # frozen model with the changes instead of rebuilding and re-validating it
+        updated = current.model_copy(update={**updates, "updated_at": utc_now_iso()})
+        self.add(updated)
+        return updated
 
-    def update(self, opportunity_id: str, updates: Dict[str, Any]) -> bool:
-        if opportunity_id not in self._items:
+    def delete(self, opportunity_id: str) -> bool:
+        row = self._row_by_id.pop(opportunity_id, None)
+        if row is None:
             return False
-        current = self._items[opportunity_id]
-        updated_data = current.dict()
-        updated_data.update(updates)
-        updated_data["updated_at"] = datetime.utcnow().isoformat()
-        self._items[opportunity_id] = Opportunity(**updated_data)
+        self._unindex(self._opportunities[row])
+        self._statuses[row] = None
+        self._opportunities[row] = None
+        self._deleted += 1
+        if self._deleted > 32 and self._deleted * 2 > len(self._opportunities):
+            self._compact()
+        self._list_cache.clear()
         return True
 
-    def delete(self, opportunity_id: str) -> bool:
-        return self._items.pop(opportunity_id, None) is not None
+
+def _filter_opportunities(
+    opportunities: Iterable[Opportunity],
+    status: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+) -> List[Opportunity]:
+    wanted_tags = set(tags or ())
+    return [
+        opp
+        for opp in opportunities
+        if (not status or opp.status == status)
+        and (not wanted_tags or not wanted_tags.isdisjoint(opp.tags))
+    ]
 
 
 _fallback_store = InMemoryOpportunities()
 
 
+def _new_id_prefix() -> str:
+    return f"{os.getpid():x}{secrets.token_hex(2)}"
+
+
+# Per-process id prefix (pid + 2 random bytes, for other hosts/replicas)
+# and a counter seeded from the startup time in ms
+_ID_PREFIX = _new_id_prefix()
+_ID_COUNTER = itertools.count(time.time_ns() // 1_000_000)
+
+
+def _reset_id_prefix() -> None:
+    global _ID_PREFIX
+    _ID_PREFIX = _new_id_prefix()
+
+
+# Forked workers would otherwise inherit the parent's prefix and counter
+# (there is no fork on Windows, and no register_at_fork either)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_prefix)
+
+
+def new_opportunity_id() -> str:
+    """Return a unique opportunity id.
+
+    Ids are a per-process prefix plus a monotonic counter, so minting one
+    needs no clock read or randomness and cannot collide within a process.
+    """
+
+    return f"opp_{_ID_PREFIX}_{next(_ID_COUNTER):x}"
+
+
 def _get_runtime_store(runtime: Optional[ToolRuntime]) -> Optional[BaseStore]:
     if runtime is None:
         return None
     return getattr(runtime, "store", None)
 
 
-def _seed_store_if_empty(store: BaseStore) -> None:
+def _is_complete_dump(value: Dict[str, Any]) -> bool:
+    return (
+        value.keys() == _FIELD_NAMES
+        and all(isinstance(value[name], str) for name in _STR_FIELDS)
+        and all(
+            isinstance(value[name], list) and all(isinstance(v, str) for v in value[name])
+            for name in _STR_LIST_FIELDS
+        )
+        and isinstance(value["confidence"], (int, float))
+        and isinstance(value["metrics"], dict)
+    )
+
+
+def _opportunity_from_store(value: Dict[str, Any]) -> Opportunity:
+    """Rebuild a stored opportunity; raises ValidationError for a bad row."""
+    if TRUST_STORE_DATA and _is_complete_dump(value):
+        return Opportunity.model_construct(**value)
+    # Unknown keys from other writers are ignored, as before extra="forbid"
+    return Opportunity.model_validate(
+        {name: v for name, v in value.items() if name in _FIELD_NAMES}
+    )
+
+
+# Stores already checked or seeded by this process, so the emptiness probe
+# runs once per store instead of on every tool call. Weakly referenced:
+# id() values are reused once a store is garbage collected.
+_SEEDED: "weakref.WeakSet[BaseStore]" = weakref.WeakSet()
+
+
+async def _seed_store_if_empty(store: BaseStore) -> None:
+    if store in _SEEDED:
+        return
     try:
-        existing = store.search(STORE_NAMESPACE, limit=1)
+        existing = await store.asearch(STORE_NAMESPACE, limit=1)
     except Exception:
         existing = []
-    if existing:
+    if not existing:
+        # One batched write instead of a round-trip per default opportunity.
+        await store.abatch(
+            [
+                PutOp(STORE_NAMESPACE, opportunity.id, opportunity.as_dict())
+                for opportunity in DEFAULT_OPPORTUNITIES
+            ]
+        )
+    _SEEDED.add(store)
+
+
+# Short-lived read-through cache for store listings, each kept sorted by
+# (created_at, id). The agent lists opportunities often, so repeated calls
+# within the TTL skip the store round-trip and the sort. Writes from this
+# process are applied to the cached listings in place; writes from other
+# workers become visible once the TTL expires. Tag filters come from the
+# model, so each store keeps at most _LIST_CACHE_SIZE listings.
+_LIST_CACHE_TTL = 5.0
+_LIST_CACHE_SIZE = 128
+_ListingKey = Tuple[Optional[str], Tuple[str, ...]]
+_list_cache: "weakref.WeakKeyDictionary[BaseStore, Dict[_ListingKey, Tuple[float, List[Opportunity]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_listing_order = attrgetter("created_at", "id")
+
+
+def _prune_listings(listings: Dict[_ListingKey, Tuple[float, List[Opportunity]]]) -> None:
+    now = time.monotonic()
+    for key in [key for key, (expires_at, _) in listings.items() if expires_at <= now]:
+        del listings[key]
+
+
+def _update_list_cache(
+    store: BaseStore, opportunity_id: str, opportunity: Optional[Opportunity]
+) -> None:
+    """Replace (or, with None, drop) an opportunity in the cached listings."""
+    listings = _list_cache.get(store)
+    if not listings:
         return
-    for opportunity in DEFAULT_OPPORTUNITIES:
-        store.put(STORE_NAMESPACE, opportunity.id, opportunity.dict())
-
-
-def _list_from_store(store: BaseStore) -> List[Opportunity]:
-    _seed_store_if_empty(store)
+    _prune_listings(listings)
+    for (status, tags), (_, opportunities) in listings.items():
+        for index, opp in enumerate(opportunities):
+            if opp.id == opportunity_id:
+                del opportunities[index]
+                break
+        if opportunity is not None and _filter_opportunities([opportunity], status, list(tags)):
+            insort(opportunities, opportunity, key=_listing_order)
+
+
+async def _list_from_store(
+    store: BaseStore,
+    status: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+) -> List[Opportunity]:
+    key = (status, tuple(sorted(tags or ())))
+    cached = _list_cache.get(store, {}).get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return list(cached[1])
+    opportunities = await _query_store(store, status, tags)
+    listings = _list_cache.setdefault(store, {})
+    listings.pop(key, None)
+    _prune_listings(listings)
+    if len(listings) >= _LIST_CACHE_SIZE:
+        # Dicts keep insertion order, so this drops the oldest listing
+        del listings[next(iter(listings))]
+    listings[key] = (time.monotonic() + _LIST_CACHE_TTL, opportunities)
+    return list(opportunities)
+
+
+async def _query_store(
+    store: BaseStore,
+    status: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+) -> List[Opportunity]:
+    await _seed_store_if_empty(store)
+    # Status is an exact match, so the store can filter it server-side. Store
+    # filters only support equality, so tag overlap is checked on the result.
     try:
-        items = store.search(STORE_NAMESPACE, limit=500)
+        items = await store.asearch(
+            STORE_NAMESPACE, filter={"status": status} if status else None, limit=500
+        )
     except Exception:
         items = []
     opportunities: List[Opportunity] = []
     for item in items or []:
         try:
-            opportunities.append(Opportunity(**item.value))
+            opportunities.append(_opportunity_from_store(item.value))
         except Exception:
             continue
-    opportunities.sort(key=lambda opp: opp.created_at)
+    if tags:
+        opportunities = _filter_opportunities(opportunities, tags=tags)
+    opportunities.sort(key=_listing_order)
     return opportunities
 
 
-def _get_from_store(store: BaseStore, opportunity_id: str) -> Optional[Opportunity]:
+async def _get_from_store(store: BaseStore, opportunity_id: str) -> Optional[Opportunity]:
+    # Not cached: update_opportunity writes the result back, so a stale
+    # copy would overwrite changes made by other workers
     try:
-        item = store.get(STORE_NAMESPACE, opportunity_id)
+        item = await store.aget(STORE_NAMESPACE, opportunity_id)
     except Exception:
         return None
     if not item:
         return None
     try:
-        return Opportunity(**item.value)
+        return _opportunity_from_store(item.value)
     except Exception:
         return None
 
 
-def _save_to_store(store: BaseStore, opportunity: Opportunity) -> None:
-    store.put(STORE_NAMESPACE, opportunity.id, opportunity.dict())
+async def _save_to_store(store: BaseStore, opportunity: Opportunity) -> None:
+    await store.aput(STORE_NAMESPACE, opportunity.id, opportunity.as_dict())
+    _update_list_cache(store, opportunity.id, opportunity)
 
 
-def _delete_from_store(store: BaseStore, opportunity_id: str) -> bool:
-    existing = _get_from_store(store, opportunity_id)
-    if not existing:
-        return False
-    store.delete(STORE_NAMESPACE, opportunity_id)
-    return True
+async def _delete_from_store(store: BaseStore, opportunity_id: str) -> bool:
+    # Read and delete in a single batch (one round-trip): the get reports
+    # whether the item existed, and deleting a missing key is a no-op.
+    existing, _ = await store.abatch(
+        [
+            GetOp(STORE_NAMESPACE, opportunity_id),
+            PutOp(STORE_NAMESPACE, opportunity_id, None),
+        ]
+    )
+    _update_list_cache(store, opportunity_id, None)
+    return existing is not None
 
 
 @tool
-def add_opportunity(
+async def add_opportunity(
     title: str,
     asset: str,
     type: str,
@@ -174,8 +501,8 @@ def add_opportunity(
         tags: Tags for categorization
     """
 
-    opportunity_id = f"opp_{uuid4().hex[:12]}"
-    created_at = datetime.utcnow().isoformat()
+    opportunity_id = new_opportunity_id()
+    created_at = utc_now_iso()
     opportunity = Opportunity(
         id=opportunity_id,
         title=title,
@@ -192,8 +519,8 @@ def add_opportunity(
 
     store = _get_runtime_store(runtime)
     if store:
-        _seed_store_if_empty(store)
-        _save_to_store(store, opportunity)
+        await _seed_store_if_empty(store)
+        await _save_to_store(store, opportunity)
     else:
         _fallback_store.add(opportunity)
 
@@ -201,47 +528,78 @@ def add_opportunity(
 
 
 @tool
-def list_opportunities(runtime: ToolRuntime) -> str:
-    """List all current investment opportunities with their details.
+async def list_opportunities(
+    runtime: ToolRuntime,
+    status: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+) -> str:
+    """List current investment opportunities with their details.
 
     Args:
         runtime: Runtime context (injected automatically)
+        status: Only return opportunities with this status (optional)
+        tags: Only return opportunities having any of these tags (optional)
     """
 
     store = _get_runtime_store(runtime)
     if store:
-        opportunities = _list_from_store(store)
+        opportunities = await _list_from_store(store, status, tags)
     else:
-        opportunities = _fallback_store.list_all()
+        opportunities = _fallback_store.list_all(status, tags)
 
     if not opportunities:
         return "No opportunities found. The opportunities list is currently empty."
 
-    result = f"📊 Found {len(opportunities)} opportunities:\n\n"
+    # Collect the pieces and join once; `+=` in the loop re-copies the
+    # whole string on every append.
+    lines: List[str] = [f"📊 Found {len(opportunities)} opportunities:\n\n"]
+    append = lines.append
     for index, opp in enumerate(opportunities, 1):
-        result += f"{index}. **{opp.title}**\n"
-        result += f"   - Asset: {opp.asset.upper()}\n"
-        result += f"   - Type: {opp.type.upper()}\n"
-        result += f"   - Confidence: {opp.confidence}%\n"
-        result += f"   - Status: {opp.status}\n"
-        result += f"   - Created: {opp.created_at}\n"
+        append(
+            f"{index}. **{opp.title}**\n"
+            f"   - Asset: {opp.asset.upper()}\n"
+            f"   - Type: {opp.type.upper()}\n"
+            f"   - Confidence: {opp.confidence}%\n"
+            f"   - Status: {opp.status}\n"
+            f"   - Created: {opp.created_at}\n"
+        )
         if opp.updated_at:
-            result += f"   - Updated: {opp.updated_at}\n"
-        result += f"   - Rationale: {opp.rationale}\n"
+            append(f"   - Updated: {opp.updated_at}\n")
+        append(f"   - Rationale: {opp.rationale}\n")
         if opp.metrics:
-            metrics_str = ", ".join(f"{k}: {v}" for k, v in opp.metrics.items())
-            result += f"   - Metrics: {metrics_str}\n"
+            # metrics is free-form: only summarize a well-formed numeric series,
+            # and print it as a plain metric if the numbers still can't be reduced
+            prices = opp.metrics.get("price_history")
+            summary = None
+            if is_numeric_series(prices):
+                try:
+                    summary = summarize(prices)
+                except (OverflowError, ValueError):
+                    pass
+            metrics_str = ", ".join(
+                f"{k}: {v}"
+                for k, v in opp.metrics.items()
+                if k != "price_history" or summary is None
+            )
+            if metrics_str:
+                append(f"   - Metrics: {metrics_str}\n")
+            if summary is not None:
+                mean, std, peak = summary
+                append(
+                    f"   - Price history: {len(prices)} points, "
+                    f"mean {mean:.4g}, std {std:.4g}, max {peak:.4g}\n"
+                )
         if opp.sources:
-            result += f"   - Sources: {', '.join(opp.sources)}\n"
+            append(f"   - Sources: {', '.join(opp.sources)}\n")
         if opp.tags:
-            result += f"   - Tags: {', '.join(opp.tags)}\n"
-        result += f"   - ID: {opp.id}\n\n"
+            append(f"   - Tags: {', '.join(opp.tags)}\n")
+        append(f"   - ID: {opp.id}\n\n")
 
-    return result.strip()
+    return "".join(lines).strip()
 
 
 @tool
-def update_opportunity(
+async def update_opportunity(
     opportunity_id: str,
     runtime: ToolRuntime,
     status: Optional[str] = None,
@@ -264,26 +622,25 @@ def update_opportunity(
         updates["status"] = status
     if confidence is not None:
         updates["confidence"] = confidence
-    updates["updated_at"] = datetime.utcnow().isoformat()
+    updates = OpportunityPatch(**updates).changes()
+    updates["updated_at"] = utc_now_iso()
 
     store = _get_runtime_store(runtime)
     if store:
-        existing = _get_from_store(store, opportunity_id)
+        existing = await _get_from_store(store, opportunity_id)
         if not existing:
             return f"✗ Opportunity {opportunity_id} not found"
-        updated_data = existing.dict()
-        updated_data.update(updates)
-        _save_to_store(store, Opportunity(**updated_data))
+        # The patch is already validated, so copy instead of re-validating
+        await _save_to_store(store, existing.model_copy(update=updates))
     else:
-        success = _fallback_store.update(opportunity_id, updates)
-        if not success:
+        if _fallback_store.update(opportunity_id, updates) is None:
             return f"✗ Opportunity {opportunity_id} not found"
 
     return f"✓ Updated opportunity {opportunity_id}"
 
 
 @tool
-def delete_opportunity(opportunity_id: str, runtime: ToolRuntime) -> str:
+async def delete_opportunity(opportunity_id: str, runtime: ToolRuntime) -> str:
     """Delete an opportunity from the opportunities list.
 
     Args:
@@ -293,7 +650,7 @@ def delete_opportunity(opportunity_id: str, runtime: ToolRuntime) -> str:
 
     store = _get_runtime_store(runtime)
     if store:
-        success = _delete_from_store(store, opportunity_id)
+        success = await _delete_from_store(store, opportunity_id)
     else:
         success = _fallback_store.delete(opportunity_id)
 
@@ -313,12 +670,12 @@ def get_opportunities_tools() -> List:
     ]
 
 
-def get_opportunities_json(store: Optional[BaseStore] = None) -> str:
+async def get_opportunities_json(store: Optional[BaseStore] = None) -> str:
     """Utility helper to export opportunities as JSON."""
 
     if store:
-        opportunities = [opp.dict() for opp in _list_from_store(store)]
+        opportunities = await _list_from_store(store)
     else:
-        opportunities = [opp.dict() for opp in _fallback_store.list_all()]
-    return json.dumps(opportunities, indent=2)
+        opportunities = _fallback_store.list_all()
+    return _OPPORTUNITIES_ADAPTER.dump_json(opportunities, indent=2).decode()
 
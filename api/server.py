@@ -5,23 +5,39 @@ Provides REST API for the front-end
 
 import os
 import json
+import orjson
 from typing import Dict, List, Optional
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.requests import HTTPConnection
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from dotenv import load_dotenv
 
 from agent.deep_agent import create_crypto_deep_agent
-from agent.opportunities_manager import _fallback_store, Opportunity
+from agent.opportunities_manager import (
+    _fallback_store,
+    Opportunity,
+    OpportunityPatch,
+    new_opportunity_id,
+)
 
 # Load environment
 load_dotenv()
 
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson (several times faster than json.dumps)"""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Crypto Analyst Agent API",
     description="API for cryptocurrency analysis and opportunities management",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=OrjsonResponse,
 )
 
 # CORS middleware - allow Vercel domains and localhost
@@ -46,8 +62,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global agent instance
-agent = None
+# Agent instance, created lazily on the first request (see get_agent)
+app.state.agent = None
+
+# Opportunities encoded per chunk when streaming the list endpoint
+OPPORTUNITIES_STREAM_BATCH = 100
 
 
 # Commented out for Vercel Serverless (lifespan events don't work well)
@@ -72,16 +91,28 @@ agent = None
 #     print("👋 Server shutdown complete")
 
 
-async def get_agent():
+async def get_agent(connection: HTTPConnection):
     """Lazy initialization of agent for Vercel Serverless"""
-    global agent
-    if agent is None:
+    state = connection.app.state
+    if state.agent is None:
         try:
-            agent = await create_crypto_deep_agent()
+            state.agent = await create_crypto_deep_agent()
         except Exception as e:
             print(f"❌ Error initializing agent: {e}")
-            raise
-    return agent
+            raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    return state.agent
+
+
+def extract_response_text(result) -> str:
+    """Pull the reply text out of an agent invocation result"""
+    if "output" in result:
+        return result["output"]
+    if "messages" in result:
+        last_message = result["messages"][-1]
+        if isinstance(last_message, dict):
+            return last_message.get("content", str(last_message))
+        return getattr(last_message, "content", str(last_message))
+    return str(result)
 
 
 # Pydantic models for API
@@ -112,7 +143,7 @@ class OpportunityCreate(BaseModel):
 
 
 class OpportunityUpdate(BaseModel):
-    updates: Dict
+    updates: OpportunityPatch
 
 
 # API Routes
@@ -127,32 +158,19 @@ async def root():
 
 
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, agent=Depends(get_agent)):
     """
     Chat with the agent
     """
     try:
-        agent = await get_agent()
         # Invoke agent
         result = await agent.ainvoke(
             {"messages": [("user", request.message)]},
             config={"configurable": {"thread_id": request.thread_id or "default"}}
         )
         
-        # Extract response
-        if "output" in result:
-            response_text = result["output"]
-        elif "messages" in result:
-            last_message = result["messages"][-1]
-            if isinstance(last_message, dict):
-                response_text = last_message.get("content", str(last_message))
-            else:
-                response_text = last_message.content if hasattr(last_message, 'content') else str(last_message)
-        else:
-            response_text = str(result)
-        
         return ChatResponse(
-            response=response_text,
+            response=extract_response_text(result),
             thread_id=request.thread_id
         )
     
@@ -162,6 +180,37 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest, agent=Depends(get_agent)):
+    """
+    Chat with the agent, streaming tokens as Server-Sent Events
+    """
+    async def event_stream():
+        # Model runs that produced stream events; a cached response arrives
+        # whole in on_chat_model_end instead, so it is sent from there
+        streamed = set()
+        try:
+            async for event in agent.astream_events(
+                {"messages": [("user", request.message)]},
+                config={"configurable": {"thread_id": request.thread_id or "default"}},
+                version="v2",
+            ):
+                if event["event"] == "on_chat_model_stream":
+                    streamed.add(event["run_id"])
+                    content = event["data"]["chunk"].content
+                elif event["event"] == "on_chat_model_end" and event["run_id"] not in streamed:
+                    content = event["data"]["output"].content
+                else:
+                    continue
+                if isinstance(content, str) and content:
+                    yield f"data: {json.dumps({'type': 'token', 'content': content})}\n\n"
+            yield f"data: {json.dumps({'type': 'end', 'thread_id': request.thread_id})}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 # =============================================================================
 # OPPORTUNITIES ROUTES (LOCAL DEVELOPMENT ONLY)
 # NOTE: In production, the frontend uses LangSmith API directly.
@@ -179,15 +228,24 @@ async def get_opportunities(
     """
     try:
         tag_list = tags.split(",") if tags else None
-        opps = _fallback_store.list_all()
-        
-        return {
-            "opportunities": [opp.dict() for opp in opps],
-            "count": len(opps)
-        }
+        opps = _fallback_store.list_all(status, tag_list)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    
+    # Stream the JSON body in batches so the full encoded payload is never
+    # held in memory at once (matters under serverless memory caps)
+    def body():
+        yield b'{"opportunities":['
+        for start in range(0, len(opps), OPPORTUNITIES_STREAM_BATCH):
+            batch = opps[start:start + OPPORTUNITIES_STREAM_BATCH]
+            chunk = b",".join(
+                orjson.dumps(opp.as_dict(), option=orjson.OPT_NON_STR_KEYS) for opp in batch
+            )
+            yield (b"," if start else b"") + chunk
+        yield b'],"count":%d}' % len(opps)
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @app.post("/api/opportunities")
@@ -196,15 +254,13 @@ async def create_opportunity(opportunity: OpportunityCreate):
     Create a new opportunity
     """
     try:
-        from datetime import datetime
-        
         # Generate ID
-        opp_id = f"opp_{int(datetime.utcnow().timestamp())}"
+        opp_id = new_opportunity_id()
         
         # Create opportunity object
         new_opp = Opportunity(
             id=opp_id,
-            **opportunity.dict()
+            **opportunity.model_dump()
         )
         
         # Add to store
@@ -213,9 +269,11 @@ async def create_opportunity(opportunity: OpportunityCreate):
         return {
             "success": True,
             "opportunity_id": opp_id,
-            "opportunity": new_opp.dict()
+            "opportunity": new_opp.as_dict()
         }
     
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
@@ -230,7 +288,7 @@ async def get_opportunity(opportunity_id: str):
     if not opp:
         raise HTTPException(status_code=404, detail="Opportunity not found")
     
-    return opp.dict()
+    return opp.as_dict()
 
 
 @app.put("/api/opportunities/{opportunity_id}")
@@ -238,15 +296,15 @@ async def update_opportunity(opportunity_id: str, update: OpportunityUpdate):
     """
     Update an opportunity
     """
-    success = _fallback_store.update(opportunity_id, update.updates)
+    # update() hands back the new row, so no second lookup is needed
+    updated_opp = _fallback_store.update(opportunity_id, update.updates.changes())
 
-    if not success:
+    if updated_opp is None:
         raise HTTPException(status_code=404, detail="Opportunity not found")
 
-    updated_opp = _fallback_store.get(opportunity_id)
     return {
         "success": True,
-        "opportunity": updated_opp.dict()
+        "opportunity": updated_opp.as_dict()
     }
 
 
@@ -271,7 +329,7 @@ async def websocket_chat(websocket: WebSocket):
     await websocket.accept()
     
     try:
-        agent = await get_agent()
+        agent = await get_agent(websocket)
         
         while True:
             # Receive message
@@ -284,19 +342,10 @@ async def websocket_chat(websocket: WebSocket):
                 config={"configurable": {"thread_id": "ws_session"}}
             )
             
-            # Extract response
-            if "output" in result:
-                response = result["output"]
-            elif "messages" in result:
-                last_msg = result["messages"][-1]
-                response = last_msg.get("content", str(last_msg)) if isinstance(last_msg, dict) else str(last_msg)
-            else:
-                response = str(result)
-            
             # Send response
             await websocket.send_json({
                 "type": "response",
-                "content": response
+                "content": extract_response_text(result)
             })
     
     except WebSocketDisconnect:
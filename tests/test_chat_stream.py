@@ -0,0 +1,55 @@
+"""
+/api/chat/stream must still send content when the model response is cached
+"""
+
+import itertools
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from api.server import app, get_agent
+
+
+def _tokens(response) -> str:
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events[-1]["type"] == "end", events
+    return "".join(e["content"] for e in events if e["type"] == "token")
+
+
+class ChatStreamCacheTest(unittest.TestCase):
+    def setUp(self):
+        model = GenericFakeChatModel(
+            messages=itertools.repeat(AIMessage(content="BTC looks strong")),
+            cache=InMemoryCache(),
+        )
+
+        async def call_model(state):
+            # The agent calls its model with ainvoke, like this
+            return {"messages": [await model.ainvoke(state["messages"])]}
+
+        agent = RunnableLambda(call_model)
+        app.dependency_overrides[get_agent] = lambda: agent
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+
+    def test_cached_response_is_streamed(self):
+        first = self.client.post("/api/chat/stream", json={"message": "btc?"})
+        cached = self.client.post("/api/chat/stream", json={"message": "btc?"})
+
+        self.assertEqual(_tokens(first), "BTC looks strong")
+        self.assertEqual(_tokens(cached), "BTC looks strong")
+
+
+if __name__ == "__main__":
+    unittest.main()